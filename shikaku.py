@@ -4,9 +4,9 @@ from __future__ import annotations
 import os
 from enum import Enum, auto
 from random import randrange
-from typing import Optional
+from typing import NamedTuple, Optional
 
-from screeninfo import get_monitors
+import numpy as np
 
 os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "hide"
 import pygame  # noqa: E402
@@ -18,28 +18,54 @@ class InputMethod(Enum):
     KEYBOARD = auto()
 
 
-def calc_cell_size(grid_size, cell_base_size) -> int:
-    monitor = get_monitors()[0]
-    screen_scale = 10.0
-    if monitor.width_mm:
-        screen_scale = monitor.width / monitor.width_mm
+def get_monitor():
+    """Return the primary monitor, or None if it can't be determined"""
+    try:
+        # Only needed by main(), so importing this module shouldn't depend on it
+        import screeninfo
+    except ImportError as e:
+        print(f"Couldn't determine screen size ({e}). Using defaults.")
+        return None
+    try:
+        return screeninfo.get_monitors()[0]
+    except (screeninfo.ScreenInfoError, IndexError) as e:
+        print(f"Couldn't determine screen size ({e}). Using defaults.")
+        return None
+
+
+def calc_cell_size(grid_size, cell_base_size, monitor=None) -> int:
+    """Scale cells to the given monitor, or to a default screen if there is none"""
+    screen_scale = DEFAULT_SCREEN_SCALE
+    screen_height = DEFAULT_SCREEN_HEIGHT
+    if monitor:
+        if monitor.width_mm:
+            screen_scale = monitor.width / monitor.width_mm
+        screen_height = monitor.height
     cell_size = cell_base_size * screen_scale
     # If too small, scale up
-    if cell_size * grid_size < monitor.height * WIN_MIN_SCREEN_PERC:
-        cell_size = (monitor.height * WIN_MIN_SCREEN_PERC) / grid_size
+    if cell_size * grid_size < screen_height * WIN_MIN_SCREEN_PERC:
+        cell_size = (screen_height * WIN_MIN_SCREEN_PERC) / grid_size
     # If too large, scale down
-    if cell_size * grid_size > monitor.height * WIN_MAX_SCREEN_PERC:
-        cell_size = (monitor.height * WIN_MAX_SCREEN_PERC) / grid_size
+    if cell_size * grid_size > screen_height * WIN_MAX_SCREEN_PERC:
+        cell_size = (screen_height * WIN_MAX_SCREEN_PERC) / grid_size
 
     return round(cell_size)
 
 
+def calc_font_size(cell_size) -> int:
+    return int(min(BASE_FONT_SIZE, cell_size * 0.85))
+
+
 GRID_SIZE = 10
 # Maximum area of a rect compared to the total area of the grid
 RECT_MAX_GRID_PERC = 0.15
 CELL_BASE_SIZE = 10
 WIN_MIN_SCREEN_PERC = 0.25
 WIN_MAX_SCREEN_PERC = 0.75
+# Used if the monitor can't be queried
+DEFAULT_SCREEN_SCALE = 10.0
+DEFAULT_SCREEN_HEIGHT = 1080
+# Adapted to the actual monitor in main(), along with FONT_SIZE
 CELL_SIZE = calc_cell_size(GRID_SIZE, CELL_BASE_SIZE)
 GRID_SUBSECTIONS = 2
 GRID_COLOR = (0, 0, 0)
@@ -55,162 +81,130 @@ DASHED_LINE_LENGTH = 3
 CAPTION = "Shikaku"
 FONT = "ubuntumono"
 BASE_FONT_SIZE = 45
-FONT_SIZE = int(min(BASE_FONT_SIZE, CELL_SIZE * 0.85))
+FONT_SIZE = calc_font_size(CELL_SIZE)
 FRAMERATE = 60
 
 
-class Point:
-    def __init__(self, *args):
-        if len(args) == 1:
-            # Not checking if iterable is bad practice, I know
-            self.x = args[0][0]
-            self.y = args[0][1]
-        elif len(args) == 2:
-            self.x = args[0]
-            self.y = args[1]
-        else:
-            raise TypeError("Point takes either iterable or two integers")
-
-    def __eq__(self, other: object) -> bool:
-        if not isinstance(other, Point):
-            return False
-        return self.x == other.x and self.y == other.y
-
-    def __repr__(self) -> str:
-        return f"<Point: x={self.x}, y={self.y}>"
+class Point(NamedTuple):
+    x: int
+    y: int
 
 
 class Rect:
+    __slots__ = (
+        "left",
+        "right",
+        "bottom",
+        "top",
+        "width",
+        "height",
+        "area",
+        "outline",
+        "color",
+        "_valid",
+    )
+    # Dashed outlines of floating rects, keyed by (width, height)
+    _floating_cache: dict[tuple[int, int], pygame.surface.Surface] = {}
+
     def __init__(self, a: Point, b: Point, color: tuple[int, int, int] = RECT_COLOR):
         self.init(a, b)
         self.color = color
-        self._valid: Optional[bool] = None
 
     def init(self, a: Point, b: Point) -> None:
-        left = min(a.x, b.x)
-        right = max(a.x, b.x)
-        bottom = max(a.y, b.y)
-        top = min(a.y, b.y)
-
-        self.top_left = Point(left, top)
-        self.bottom_right = Point(right, bottom)
+        """(Re-)initialize the rect from two opposite corners"""
+        self._valid: Optional[bool] = None
+        self.left = min(a.x, b.x)
+        self.right = max(a.x, b.x)
+        self.bottom = max(a.y, b.y)
+        self.top = min(a.y, b.y)
 
-        self.width = self.bottom_right.x - self.top_left.x + 1
-        self.height = self.bottom_right.y - self.top_left.y + 1
+        self.width = self.right - self.left + 1
+        self.height = self.bottom - self.top + 1
         self.area = self.width * self.height
 
-    def intersects(self, other: Rect) -> bool:
-        return (
-            self.top_left.x <= other.bottom_right.x
-            and self.bottom_right.x >= other.top_left.x
-        ) and (
-            self.top_left.y <= other.bottom_right.y
-            and self.bottom_right.y >= other.top_left.y
-        )
-
-    def contains_point(self, other: Point) -> bool:
-        return (self.top_left.x <= other.x <= self.bottom_right.x) and (
-            self.top_left.y <= other.y <= self.bottom_right.y
+        # Outline in pixels relative to the grid, so it needn't be computed every frame
+        self.outline = pygame.Rect(
+            self.left * CELL_SIZE - RECT_THICKNESS // 2,
+            self.top * CELL_SIZE - RECT_THICKNESS // 2,
+            self.width * CELL_SIZE + RECT_THICKNESS,
+            self.height * CELL_SIZE + RECT_THICKNESS,
         )
 
     def draw(self, screen, offset=[0, 0]) -> None:
         pygame.draw.rect(
-            screen,
-            self.color,
-            [
-                offset[0] + self.top_left.x * CELL_SIZE - RECT_THICKNESS // 2,
-                offset[1] + self.top_left.y * CELL_SIZE - RECT_THICKNESS // 2,
-                self.width * CELL_SIZE + RECT_THICKNESS,
-                self.height * CELL_SIZE + RECT_THICKNESS,
-            ],
-            RECT_THICKNESS,
+            screen, self.color, self.outline.move(offset[0], offset[1]), RECT_THICKNESS
         )
 
     def draw_floating(self, screen, offset=[0, 0]) -> None:
         """Draw rect using dashed lines"""
-        for x in range(
-            self.top_left.x * CELL_SIZE,
-            (self.bottom_right.x + 1) * CELL_SIZE,
-            DASHED_LINE_INTERVAL,
-        ):
+        size = (self.width, self.height)
+        if size not in Rect._floating_cache:
+            Rect._floating_cache[size] = self._render_floating()
+        screen.blit(
+            Rect._floating_cache[size],
+            [
+                offset[0] + self.left * CELL_SIZE,
+                offset[1] + self.top * CELL_SIZE,
+            ],
+        )
+
+    def _render_floating(self) -> pygame.surface.Surface:
+        """Render the dashed outline of a rect of this size onto a transparent Surface.
+
+        The surface is converted to the display's pixel format, so a video mode must be set.
+        """
+        width = self.width * CELL_SIZE
+        height = self.height * CELL_SIZE
+        surface = pygame.Surface([width + 1, height + 1], pygame.SRCALPHA)
+        for x in range(0, width, DASHED_LINE_INTERVAL):
             pygame.draw.line(
-                screen,
+                surface,
                 RECT_COLOR_FLOATING,
-                [offset[0] + x, offset[1] + self.top_left.y * CELL_SIZE],
-                [
-                    min(
-                        offset[0] + x + DASHED_LINE_LENGTH,
-                        (self.bottom_right.x + 1) * CELL_SIZE,
-                    ),
-                    offset[1] + self.top_left.y * CELL_SIZE,
-                ],
+                [x, 0],
+                [min(x + DASHED_LINE_LENGTH, width), 0],
                 width=DASHED_LINE_THICKNESS,
             )
             pygame.draw.line(
-                screen,
+                surface,
                 RECT_COLOR_FLOATING,
-                [offset[0] + x, offset[1] + (self.bottom_right.y + 1) * CELL_SIZE],
-                [
-                    min(
-                        offset[0] + x + DASHED_LINE_LENGTH,
-                        (self.bottom_right.x + 1) * CELL_SIZE,
-                    ),
-                    offset[1] + (self.bottom_right.y + 1) * CELL_SIZE,
-                ],
+                [x, height],
+                [min(x + DASHED_LINE_LENGTH, width), height],
                 width=DASHED_LINE_THICKNESS,
             )
-        for y in range(
-            self.top_left.y * CELL_SIZE,
-            (self.bottom_right.y + 1) * CELL_SIZE,
-            DASHED_LINE_INTERVAL,
-        ):
+        for y in range(0, height, DASHED_LINE_INTERVAL):
             pygame.draw.line(
-                screen,
+                surface,
                 RECT_COLOR_FLOATING,
-                [offset[0] + self.top_left.x * CELL_SIZE, offset[1] + y],
-                [
-                    offset[0] + self.top_left.x * CELL_SIZE,
-                    min(
-                        offset[1] + y + DASHED_LINE_LENGTH,
-                        (self.bottom_right.y + 1) * CELL_SIZE,
-                    ),
-                ],
+                [0, y],
+                [0, min(y + DASHED_LINE_LENGTH, height)],
                 width=DASHED_LINE_THICKNESS,
             )
             pygame.draw.line(
-                screen,
+                surface,
                 RECT_COLOR_FLOATING,
-                [offset[0] + (self.bottom_right.x + 1) * CELL_SIZE, offset[1] + y],
-                [
-                    offset[0] + (self.bottom_right.x + 1) * CELL_SIZE,
-                    min(
-                        offset[1] + y + DASHED_LINE_LENGTH,
-                        (self.bottom_right.y + 1) * CELL_SIZE,
-                    ),
-                ],
+                [width, y],
+                [width, min(y + DASHED_LINE_LENGTH, height)],
                 width=DASHED_LINE_THICKNESS,
             )
+        return surface.convert_alpha()
 
     def is_valid(self) -> Optional[bool]:
         """Returns validity if it has been checked, otherwise None."""
         return self._valid
 
-    def verify(self, numbers: list[list[int]]) -> bool:
-        contains_number = False
-        for x in range(self.top_left.x, self.bottom_right.x + 1):
-            for y in range(self.top_left.y, self.bottom_right.y + 1):
-                if numbers[y][x]:
-                    if contains_number or not self.area == numbers[y][x]:
-                        self._valid = False
-                        self.color = RECT_COLOR_INVALID
-                        return False
-                    contains_number = True
-        if not contains_number:
-            self._valid = False
+    def verify(self, numbers: np.ndarray) -> bool:
+        """Check that the rect contains exactly one number, which is equal to its area.
+
+        Numbers don't change during a game, so the result is only computed once."""
+        if self._valid is not None:
+            return self._valid
+        contained = numbers[self.top : self.bottom + 1, self.left : self.right + 1]
+        self._valid = (
+            np.count_nonzero(contained) == 1 and int(contained.sum()) == self.area
+        )
+        if not self._valid:
             self.color = RECT_COLOR_INVALID
-            return False
-        self._valid = True
-        return True
+        return self._valid
 
 
 class NumberRenderer:
@@ -219,6 +213,7 @@ class NumberRenderer:
         font_name: str,
         font_size: int,
         color: tuple[int, int, int],
+        max_number: int,
         font_path: Optional[str] = None,
     ):
         if font_path:
@@ -231,187 +226,140 @@ class NumberRenderer:
             self.font_obj = pygame.font.SysFont(font_name, font_size)
         self.size = font_size
         self.color = color
-        # Store already rendered numbers
-        self.render_cache: dict[int, pygame.surface.Surface] = {}
-
-    def get(self, number: int) -> pygame.surface.Surface:
-        """Return a Surface with the rendered bitmap of the given number.
+        # Numbers 1 to max_number, rendered in advance along with the offset that
+        # centers them in a cell
+        self.render_cache = [
+            self._render(number) for number in range(1, max_number + 1)
+        ]
 
-        If possible, already cached results will be used."""
-        if number not in self.render_cache:
-            self.render_cache[number] = self._render(number)
-        return self.render_cache[number]
+    def get(self, number: int) -> tuple[pygame.surface.Surface, tuple[int, int]]:
+        """Return a Surface with the rendered bitmap of the given number, as well as the
+        offset at which it must be drawn to be centered in a cell."""
+        return self.render_cache[number - 1]
 
-    def _render(self, number: int) -> pygame.surface.Surface:
-        return self.font_obj.render(str(number), True, self.color)
+    def _render(self, number: int) -> tuple[pygame.surface.Surface, tuple[int, int]]:
+        rendered = self.font_obj.render(str(number), True, self.color)
+        width, height = rendered.get_size()
+        return rendered, ((CELL_SIZE - width) // 2, (CELL_SIZE - height) // 2)
 
 
 class Game:
+    # Loading the font and rendering all numbers is only done once per grid size, so
+    # that starting a new game doesn't have to repeat it
+    _number_renderers: dict[int, NumberRenderer] = {}
+
     def __init__(self, grid_size) -> None:
         self.grid_size = grid_size
         self.grid_area = grid_size * grid_size
         self.total_size = grid_size * CELL_SIZE
         self.rects: list[Rect] = []
         self.rect_area = 0
-        # Store for each cell wether it is covered by a rectangle
-        self.covered = empty_square_grid(grid_size)
+        # Store for each cell the index of the rect covering it, or -1 if uncovered
+        self.rect_at = np.full((grid_size, grid_size), -1, dtype=np.int32)
         self.numbers = self.generate_numbers()
-        self.number_renderer = NumberRenderer(FONT, FONT_SIZE, GRID_COLOR)
+        if self.grid_area not in Game._number_renderers:
+            Game._number_renderers[self.grid_area] = NumberRenderer(
+                FONT, FONT_SIZE, GRID_COLOR, self.grid_area
+            )
+        self.number_renderer = Game._number_renderers[self.grid_area]
+        self.grid_surface = self._render_grid()
+        self.numbers_surface = self._render_numbers()
+        # Grid, rects and numbers combined; None if the rects have changed since
+        self.board_surface: Optional[pygame.surface.Surface] = None
 
         # Input stuff
         self.input_rect: Optional[Rect] = None
+        # Corners the input rect was last spanned between
+        self.input_corners: Optional[tuple[Point, Point]] = None
         self.start_cell: Optional[Point] = None
         self.cursor_cell: Optional[Point] = None
         self.start_cell_set = False
 
         self.input_method = InputMethod.NONE
+        # Whether the game needs to be redrawn, i. e. whether the rects, the input rect
+        # or the input state have changed since the last draw
+        self.dirty = True
 
-    def generate_numbers(self) -> list[list[int]]:
-        total_area = self.grid_size * self.grid_size
+    def generate_numbers(self) -> np.ndarray:
+        max_rect_area = int(self.grid_area * RECT_MAX_GRID_PERC)
+        # Index of the rect occupying each cell, or -1 if unoccupied
+        rect_at = np.empty((self.grid_size, self.grid_size), dtype=np.int32)
 
         while True:
             n_occupied = 0
-            occupied = empty_square_grid(self.grid_size)
-            numbers = empty_square_grid(self.grid_size)
+            # Reuse the same grid if generation has to be retried
+            rect_at.fill(-1)
             rects: list[Rect] = []
 
-            while n_occupied < total_area:
+            while n_occupied < self.grid_area:
                 # Choose a random unoccupied cell
-                n = randrange(total_area - n_occupied)
-                done = False
-                for y, row in enumerate(occupied):
-                    for x, cell in enumerate(row):
-                        if done:
-                            break
-                        if cell:
-                            continue
-                        if not n:
-                            # One corner of the rectangle
-                            A = [x, y]
-                            # Determine available space left and right of A
-                            _x = x
-                            while True:
-                                if _x < 0 or occupied[y][_x]:
-                                    space_left = (x - _x) - 1
-                                    break
-                                _x -= 1
-                            _x = x
-                            while True:
-                                if _x >= self.grid_size or occupied[y][_x]:
-                                    space_right = (_x - x) - 1
-                                    break
-                                _x += 1
-                            # Choose x-coordinate of B
-                            B_x = (
-                                A[0]
-                                - space_left
-                                + randrange(space_left + space_right + 1)
-                            )
-                            # Determine available space above and below
-                            _y = y
-                            while True:
-                                if _y < 0 or any(
-                                    [
-                                        occupied[_y][_x]
-                                        for _x in range(
-                                            min(A[0], B_x), max(A[0], B_x) + 1
-                                        )
-                                    ]
-                                ):
-                                    space_above = (y - _y) - 1
-                                    break
-                                _y -= 1
-                            _y = y
-                            while True:
-                                if _y >= self.grid_size or any(
-                                    [
-                                        occupied[_y][_x]
-                                        for _x in range(
-                                            min(A[0], B_x), max(A[0], B_x) + 1
-                                        )
-                                    ]
-                                ):
-                                    space_below = (_y - y) - 1
-                                    break
-                                _y += 1
-                            # TODO: This only limits height, resulting in a tendency for wide rectangles, since width is unlimited
-                            # Find a way to limit height just as much as width
-                            max_height = int(self.grid_area * RECT_MAX_GRID_PERC) // (
-                                abs(B_x - A[0]) + 1
-                            )
-                            space_above = min(space_above, max_height)
-                            space_below = min(space_below, max_height)
-                            B_y = (
-                                A[1]
-                                - space_above
-                                + randrange(space_above + space_below + 1)
-                            )
-                            B = [B_x, B_y]
-                            # Habemus rectiangulum!
-                            rect = Rect(Point(A), Point(B))
-                            # Mark area covered by rectangle as occupied
-                            for _x in range(rect.top_left.x, rect.bottom_right.x + 1):
-                                for _y in range(
-                                    rect.top_left.y, rect.bottom_right.y + 1
-                                ):
-                                    occupied[_y][_x] = 1
-                            # Add area to total number of occupied cells
-                            n_occupied += rect.area
-                            rects.append(rect)
-                            done = True
-                        n -= 1
-
-            # Eliminate 1x1 rectangles
+                free = np.flatnonzero(rect_at < 0)
+                y, x = divmod(int(free[randrange(free.size)]), self.grid_size)
+                # One corner of the rectangle, A, is (x, y)
+                # Determine available space left and right of A
+                space_left, space_right = space_around(rect_at[y] >= 0, x)
+                # Choose x-coordinate of B
+                B_x = x - space_left + randrange(space_left + space_right + 1)
+                # Determine available space above and below
+                space_above, space_below = space_around(
+                    (rect_at[:, min(x, B_x) : max(x, B_x) + 1] >= 0).any(axis=1), y
+                )
+                # TODO: This only limits height, resulting in a tendency for wide rectangles, since width is unlimited
+                # Find a way to limit height just as much as width
+                max_height = max_rect_area // (abs(B_x - x) + 1)
+                space_above = min(space_above, max_height)
+                space_below = min(space_below, max_height)
+                # 1x1 rects have to be merged later on, which fails regularly and
+                # forces a retry, so avoid them unless the cell is enclosed
+                if B_x == x and not (space_above or space_below):
+                    if space_left or space_right:
+                        B_x = random_other(x, space_left, space_right)
+                    B_y = y
+                elif B_x == x:
+                    B_y = random_other(y, space_above, space_below)
+                else:
+                    B_y = y - space_above + randrange(space_above + space_below + 1)
+                # Habemus rectiangulum!
+                rect = Rect(Point(x, y), Point(B_x, B_y))
+                # Mark area covered by rectangle as occupied
+                i = len(rects)
+                rect_at[rect.top : rect.bottom + 1, rect.left : rect.right + 1] = i
+                # Add area to total number of occupied cells
+                n_occupied += rect.area
+                rects.append(rect)
+
+            # Eliminate 1x1 rectangles by merging them into an adjacent rect
             success = True
-            i = 0
-            while i < len(rects):
-                if rects[i].width == rects[i].height == 1:
-                    # Find adjacent rect and merge
-                    for j, other in enumerate(rects):
-                        if (
-                            other.height == 1
-                            and other.top_left.y == rects[i].top_left.y
-                        ):
-                            if other.top_left.x == rects[i].top_left.x + 1:
-                                rects[j] = Rect(
-                                    Point(other.top_left.x - 1, other.top_left.y),
-                                    other.bottom_right,
-                                )
-                                break
-                            elif other.bottom_right.x == rects[i].top_left.x - 1:
-                                rects[j] = Rect(
-                                    other.top_left,
-                                    Point(
-                                        other.bottom_right.x + 1, other.bottom_right.y
-                                    ),
-                                )
-                                break
-                        if other.width == 1 and other.top_left.x == rects[i].top_left.x:
-                            if other.top_left.y == rects[i].top_left.y + 1:
-                                rects[j] = Rect(
-                                    Point(other.top_left.x, other.top_left.y - 1),
-                                    other.bottom_right,
-                                )
-                                break
-                            elif other.bottom_right.y == rects[i].bottom_right.y - 1:
-                                rects[j] = Rect(
-                                    other.top_left,
-                                    Point(
-                                        other.bottom_right.x, other.bottom_right.y + 1
-                                    ),
-                                )
-                                break
-                    else:
-                        success = False
-                    rects.pop(i)
+            for rect in rects:
+                if rect.area != 1:
+                    continue
+                x, y = rect.left, rect.top
+                for n_x, n_y in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                    if not (0 <= n_x < self.grid_size and 0 <= n_y < self.grid_size):
+                        continue
+                    j = int(rect_at[n_y, n_x])
+                    other = rects[j]
+                    # Merging only yields a rectangle if the neighbor is one cell thick
+                    if (other.height if n_y == y else other.width) == 1:
+                        rects[j] = Rect(
+                            Point(min(x, other.left), min(y, other.top)),
+                            Point(max(x, other.right), max(y, other.bottom)),
+                        )
+                        rect_at[y, x] = j
+                        break
                 else:
-                    i += 1
+                    success = False
+                    break
             if success:
+                rects = [rect for rect in rects if rect.area > 1]
                 break
 
+        # Numbers can exceed 255 for large grids
+        numbers = empty_square_grid(self.grid_size, np.uint16)
         for rect in rects:
-            numbers[rect.top_left.y + randrange(rect.height)][
-                rect.top_left.x + randrange(rect.width)
+            numbers[
+                rect.top + randrange(rect.height),
+                rect.left + randrange(rect.width),
             ] = rect.area
         return numbers
 
@@ -421,8 +369,10 @@ class Game:
         if until_number:
             self.start_cell = self._next_number(self.start_cell, dir_x, dir_y)
         else:
-            self.start_cell.x = max(0, min(GRID_SIZE - 1, self.start_cell.x + dir_x))
-            self.start_cell.y = max(0, min(GRID_SIZE - 1, self.start_cell.y + dir_y))
+            self.start_cell = Point(
+                max(0, min(GRID_SIZE - 1, self.start_cell.x + dir_x)),
+                max(0, min(GRID_SIZE - 1, self.start_cell.y + dir_y)),
+            )
         if not self.start_cell_set:
             self._reset_cursor_cell()
 
@@ -432,18 +382,31 @@ class Game:
                 print("ERROR: Cannot set cursor_cell before start_cell is set")
                 return None
             self._reset_cursor_cell()
-        self.cursor_cell.x = max(0, min(GRID_SIZE - 1, self.cursor_cell.x + dir_x))  # type: ignore
-        self.cursor_cell.y = max(0, min(GRID_SIZE - 1, self.cursor_cell.y + dir_y))  # type: ignore
+        self.cursor_cell = Point(
+            max(0, min(GRID_SIZE - 1, self.cursor_cell.x + dir_x)),  # type: ignore
+            max(0, min(GRID_SIZE - 1, self.cursor_cell.y + dir_y)),  # type: ignore
+        )
 
     def _reset_cursor_cell(self) -> None:
         if self.start_cell:
-            self.cursor_cell = Point(self.start_cell.x, self.start_cell.y)
+            self.cursor_cell = self.start_cell
         self.start_cell_set = False
 
+    def _update_input_rect(self, start: Point, cursor: Point) -> None:
+        """Span the input rect between start and cursor, reusing the existing object"""
+        if not self.input_rect:
+            self.input_rect = Rect(start, cursor)
+        elif (start, cursor) != self.input_corners:
+            self.input_rect.init(start, cursor)
+        else:
+            return
+        self.input_corners = (start, cursor)
+        self.dirty = True
+
     def _next_number(self, start: Point, dir_x: int, dir_y: int) -> Point:
         if dir_x and dir_y:
             raise Exception("Can't move diagonally")
-        step = Point(start.x, start.y)
+        step = start
         while True:
             if (
                 (dir_x > 0 and step.x == self.grid_size - 1)
@@ -452,9 +415,8 @@ class Game:
                 or (dir_y < 0 and step.y == 0)
             ):
                 return step
-            step.x += dir_x
-            step.y += dir_y
-            if self.numbers[step.y][step.x]:
+            step = Point(step.x + dir_x, step.y + dir_y)
+            if self.numbers[step.y, step.x]:
                 return step
 
     def _autofill(
@@ -488,8 +450,9 @@ class Game:
                 return False, Point(-1, -1)
             for i in range(0, breadth * step, step):
                 if n := self.numbers[
-                    start.y + dir_y * (length - 1) + (1 - abs(dir_y)) * i
-                ][start.x + dir_x * (length - 1) + (1 - abs(dir_x)) * i]:
+                    start.y + dir_y * (length - 1) + (1 - abs(dir_y)) * i,
+                    start.x + dir_x * (length - 1) + (1 - abs(dir_x)) * i,
+                ]:
                     if number:
                         return False, Point(-1, -1)
                     else:
@@ -517,10 +480,19 @@ class Game:
         the game object should be destroyed and replaced by a new instance."""
         stop = False
         reset = False
+        input_state = (
+            self.input_rect,
+            self.start_cell,
+            self.cursor_cell,
+            self.start_cell_set,
+        )
         for event in events:
             if event.type == pygame.QUIT:
                 stop = True
                 break
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                # Window contents were lost and have to be redrawn
+                self.dirty = True
             elif event.type == pygame.KEYDOWN:
                 ctrl_down = bool(pygame.key.get_mods() & pygame.KMOD_CTRL)
                 if event.key == pygame.K_ESCAPE:
@@ -589,8 +561,9 @@ class Game:
                         if self.start_cell == self.cursor_cell:
                             continue
                         reset = self.new_rect(self.input_rect)
-                        self.start_cell.x = self.cursor_cell.x
-                        self.start_cell.y = self.cursor_cell.y
+                        # The input rect is now part of the grid and mustn't be reused
+                        self.input_rect = None
+                        self.start_cell = self.cursor_cell
                         self.start_cell_set = False
                     elif self.start_cell:
                         # TODO: Change color of input rect if start cell is set
@@ -605,7 +578,7 @@ class Game:
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 self.input_method = InputMethod.MOUSE
                 if event.button == 1:  # Left click
-                    self.start_cell = Point(pos_to_cell(event.pos, GRID_DRAWING_POS))
+                    self.start_cell = Point(*pos_to_cell(event.pos, GRID_DRAWING_POS))
                 elif event.button == 3:  # Right click
                     self.input_rect = None
                     self.start_cell = None
@@ -631,70 +604,91 @@ class Game:
         if self.input_method == InputMethod.MOUSE:
             if self.start_cell:
                 self.cursor_cell = Point(
-                    pos_to_cell(pygame.mouse.get_pos(), GRID_DRAWING_POS)
+                    *pos_to_cell(pygame.mouse.get_pos(), GRID_DRAWING_POS)
                 )
-                self.input_rect = Rect(self.start_cell, self.cursor_cell)
+                self._update_input_rect(self.start_cell, self.cursor_cell)
         elif self.input_method == InputMethod.KEYBOARD:
             if self.start_cell and self.cursor_cell:
-                self.input_rect = Rect(self.start_cell, self.cursor_cell)
+                self._update_input_rect(self.start_cell, self.cursor_cell)
+
+        if input_state != (
+            self.input_rect,
+            self.start_cell,
+            self.cursor_cell,
+            self.start_cell_set,
+        ):
+            self.dirty = True
 
         return (not stop), reset
 
-    def draw(self, screen: pygame.surface.Surface, pos=[0, 0]) -> None:
+    def _render_grid(self) -> pygame.surface.Surface:
+        """Render the grid onto a transparent Surface, so it needn't be redrawn every frame"""
+        surface = pygame.Surface([self.total_size, self.total_size], pygame.SRCALPHA)
+        # Pixel coordinates of all grid lines and subsections, excluding the border
+        subsections = np.arange(1, self.grid_size * GRID_SUBSECTIONS)
+        ticks = np.rint((subsections / GRID_SUBSECTIONS) * CELL_SIZE).astype(int)
+        lines = ticks[subsections % GRID_SUBSECTIONS == 0]
+        # Draw dotted lines; the surface stays locked as long as `pixels` exists
+        pixels = pygame.surfarray.pixels2d(surface)
+        # map_rgb() may return a signed int, so cast it to the pixel type explicitly
+        color = np.array(surface.map_rgb(GRID_COLOR)).astype(pixels.dtype)
+        pixels[np.ix_(lines, ticks)] = color
+        pixels[np.ix_(ticks, lines)] = color
+        del pixels
+        # Draw intersections of lines
+        corners = (lines - RECT_THICKNESS // 2).tolist()
+        for x in corners:
+            for y in corners:
+                pygame.draw.rect(
+                    surface, GRID_COLOR, [x, y, RECT_THICKNESS, RECT_THICKNESS], 0
+                )
+        return surface
+
+    def _render_numbers(self) -> pygame.surface.Surface:
+        """Render all numbers onto a transparent Surface, since they don't change during a game"""
+        surface = pygame.Surface([self.total_size, self.total_size], pygame.SRCALPHA)
+        for y, x in zip(*np.nonzero(self.numbers)):
+            rendered, offset = self.number_renderer.get(self.numbers[y, x])
+            surface.blit(
+                rendered, [x * CELL_SIZE + offset[0], y * CELL_SIZE + offset[1]]
+            )
+        return surface
+
+    def _render_board(self) -> pygame.surface.Surface:
+        """Render grid, rects and numbers onto a transparent Surface, so that it only needs
+        to be redone when the rects change. The surface has a margin of RECT_THICKNESS // 2
+        on each side to fit the outlines of rects at the border of the grid.
+
+        Like the floating outlines, the surface is converted to the display's pixel format,
+        so a video mode must be set before drawing the game, even onto another Surface.
+        """
+        margin = RECT_THICKNESS // 2
+        size = self.total_size + RECT_THICKNESS
+        surface = pygame.Surface([size, size], pygame.SRCALPHA)
+        offset = [margin, margin]
         # Draw grid
-        for x in range(1, self.grid_size * GRID_SUBSECTIONS):
-            for y in range(1, self.grid_size * GRID_SUBSECTIONS):
-                if (not x % GRID_SUBSECTIONS) and (not y % GRID_SUBSECTIONS):
-                    pygame.draw.rect(
-                        screen,
-                        GRID_COLOR,
-                        [
-                            pos[0]
-                            + (x // GRID_SUBSECTIONS) * CELL_SIZE
-                            - RECT_THICKNESS // 2,
-                            pos[0]
-                            + (y // GRID_SUBSECTIONS) * CELL_SIZE
-                            - RECT_THICKNESS // 2,
-                            RECT_THICKNESS,
-                            RECT_THICKNESS,
-                        ],
-                        0,
-                    )
-                elif (not x % GRID_SUBSECTIONS) or (not y % GRID_SUBSECTIONS):
-                    screen.set_at(
-                        [
-                            round(pos[0] + (x / GRID_SUBSECTIONS) * CELL_SIZE),
-                            round(pos[0] + (y / GRID_SUBSECTIONS) * CELL_SIZE),
-                        ],
-                        GRID_COLOR,
-                    )
+        surface.blit(self.grid_surface, offset)
         # List of rectangles to draw on top (i. e. after the rest of the rectangles)
         # Invalid rectangles are thereby highlighted
         on_top = []
         for i, rect in enumerate(self.rects):
             if rect.is_valid():
-                rect.draw(screen, pos)
+                rect.draw(surface, offset)
             else:
                 on_top.append(i)
         for i in on_top:
-            self.rects[i].draw(screen, pos)
+            self.rects[i].draw(surface, offset)
 
         # Draw numbers
-        for y, row in enumerate(self.numbers):
-            for x, number in enumerate(row):
-                if number:
-                    rendered = self.number_renderer.get(number)
-                    offset = [
-                        int((CELL_SIZE - rendered.get_size()[0]) / 2),
-                        int((CELL_SIZE - rendered.get_size()[1]) / 2),
-                    ]
-                    screen.blit(
-                        rendered,
-                        [
-                            pos[0] + x * CELL_SIZE + offset[0],
-                            pos[1] + y * CELL_SIZE + offset[1],
-                        ],
-                    )
+        surface.blit(self.numbers_surface, offset)
+        # Blitted every frame, so match the display's pixel format
+        return surface.convert_alpha()
+
+    def draw(self, screen: pygame.surface.Surface, pos=[0, 0]) -> None:
+        if self.board_surface is None:
+            self.board_surface = self._render_board()
+        margin = RECT_THICKNESS // 2
+        screen.blit(self.board_surface, [pos[0] - margin, pos[1] - margin])
         # Draw input rect
         if self.input_rect:
             self.input_rect.draw_floating(screen, GRID_DRAWING_POS)
@@ -702,10 +696,8 @@ class Game:
     def new_rect(self, new: Rect) -> bool:
         # Check if rect contained in grid
         if not (
-            0 <= new.top_left.x < self.grid_size
-            and 0 <= new.bottom_right.x < self.grid_size
-            and 0 <= new.top_left.y < self.grid_size
-            and 0 <= new.bottom_right.y < self.grid_size
+            0 <= new.left <= new.right < self.grid_size
+            and 0 <= new.top <= new.bottom < self.grid_size
         ):
             return False
 
@@ -714,314 +706,128 @@ class Game:
 
         # Add implicitly created rects (rectangle-shaped, uncovered areas enclosed by
         # other rectangles that contain exactly one number)
-        # Find uncovered cells that are horiz. or vert. adjacent to just created rectangle
-        def is_covered(x: int, y: int) -> bool:
-            if not (0 <= x < self.grid_size and 0 <= y < self.grid_size):
+        implicit_rects = [
+            rect
+            for dir_x, dir_y in ((0, -1), (0, 1), (1, 0), (-1, 0))
+            for rect in self._implicit_rects(new, dir_x, dir_y)
+        ]
+        for rect in implicit_rects:
+            self._append_rect(rect)
+
+        return self.verify()
+
+    def _implicit_rects(self, new: Rect, dir_x: int, dir_y: int) -> list[Rect]:
+        """Find implicitly created rects on the side of a new rect given by dir_x, dir_y.
+
+        To treat all sides alike, cells are addressed as (u, v), where u runs along the
+        side of the new rect and v runs away from it."""
+        if dir_x:
+            covered = self.rect_at.T >= 0
+            numbers = self.numbers.T
+            first, last = new.top, new.bottom
+            edge = new.right if dir_x > 0 else new.left
+        else:
+            covered = self.rect_at >= 0
+            numbers = self.numbers
+            first, last = new.left, new.right
+            edge = new.bottom if dir_y > 0 else new.top
+        step = dir_x + dir_y
+        near = edge + step
+        if not 0 <= near < self.grid_size:
+            return []
+
+        def is_covered(u: int, v: int) -> bool:
+            if not (0 <= u < self.grid_size and 0 <= v < self.grid_size):
                 return True
-            return bool(self.covered[y][x])
-
-        above = []
-        below = []
-        left = []
-        right = []
-        for x in range(new.top_left.x, new.bottom_right.x + 1):
-            if not is_covered(x, new.top_left.y - 1):
-                above.append([x, new.top_left.y - 1])
-            if not is_covered(x, new.bottom_right.y + 1):
-                below.append([x, new.bottom_right.y + 1])
-        for y in range(new.top_left.y, new.bottom_right.y + 1):
-            if not is_covered(new.top_left.x - 1, y):
-                left.append([new.top_left.x - 1, y])
-            if not is_covered(new.bottom_right.x + 1, y):
-                right.append([new.bottom_right.x + 1, y])
+            return bool(covered[v, u])
 
+        # Find uncovered cells that are adjacent to the new rect
+        cells = {u for u in range(first, last + 1) if not covered[near, u]}
         implicit_rects = []
         # This has a worst-case complexity of O(N^3), however the worst case is rarely reached.
         # It will mostly be just O(N^2), since there will be only one continuous block of uncovered cells
-        # directly adjacent to one side of the rectangle, so that above == [] after the first iteration.
-        while above:
-            cell = above.pop()
-            left_bound = right_bound = cell[0]
-            while not is_covered(left_bound, cell[1]):
-                left_bound -= 1
-            while not is_covered(right_bound, cell[1]):
-                right_bound += 1
-            # Assert lower bound consists of covered cells
-            if not all(
-                is_covered(x, new.top_left.y)
-                for x in range(left_bound + 1, right_bound)
-            ):
-                continue
-            lower_bound = cell[1]
-            visited_numbers = 0
-            failed = False
-            while not failed:
-                # Check for upper bound
-                if lower_bound < cell[1] and any(
-                    is_covered(x, lower_bound)
-                    for x in range(left_bound + 1, right_bound)
-                ):
-                    break
-                if not is_covered(left_bound, lower_bound) or not is_covered(
-                    right_bound, lower_bound
-                ):
-                    failed = True
-                    break
-                visited_numbers += sum(
-                    bool(self.numbers[lower_bound][x])
-                    for x in range(left_bound + 1, right_bound)
-                )
-                if visited_numbers > 1:
-                    failed = True
-                    break
-                # Remove visited cells
-                above = [
-                    cell
-                    for cell in above
-                    if not (
-                        left_bound < cell[0] < right_bound and cell[1] == lower_bound
-                    )
-                ]
-                lower_bound -= 1
-
-            if failed or visited_numbers != 1:
-                continue
-            if (
-                all(
-                    is_covered(x, lower_bound)
-                    for x in range(left_bound + 1, right_bound)
-                )
-                and (right_bound - left_bound - 1 + new.top_left.y - lower_bound - 1)
-                > 2
-            ):
-                implicit_rects.append(
-                    Rect(
-                        Point(left_bound + 1, lower_bound + 1),
-                        Point(right_bound - 1, new.top_left.y - 1),
-                    )
-                )
-        while below:
-            cell = below.pop()
-            left_bound = right_bound = cell[0]
-            while not is_covered(left_bound, cell[1]):
-                left_bound -= 1
-            while not is_covered(right_bound, cell[1]):
-                right_bound += 1
-            # Assert upper bound consists of covered cells
-            if not all(
-                is_covered(x, new.bottom_right.y)
-                for x in range(left_bound - 1, right_bound)
-            ):
-                continue
-            lower_bound = cell[1]
-            visited_numbers = 0
-            failed = False
-            while not failed:
-                # Check for upper bound
-                if lower_bound > cell[1] and any(
-                    is_covered(x, lower_bound)
-                    for x in range(left_bound + 1, right_bound)
-                ):
-                    break
-                if not is_covered(left_bound, lower_bound) or not is_covered(
-                    right_bound, lower_bound
-                ):
-                    failed = True
-                    break
-                visited_numbers += sum(
-                    bool(self.numbers[lower_bound][x])
-                    for x in range(left_bound + 1, right_bound)
-                )
-                if visited_numbers > 1:
-                    failed = True
-                    break
-                # Remove visited cells
-                below = [
-                    cell
-                    for cell in below
-                    if not (
-                        left_bound < cell[0] < right_bound and cell[1] == lower_bound
-                    )
-                ]
-                lower_bound += 1
-
-            if failed or visited_numbers != 1:
-                continue
-            if (
-                all(
-                    is_covered(x, lower_bound)
-                    for x in range(left_bound + 1, right_bound)
-                )
-                and (
-                    right_bound - left_bound - 1 + lower_bound - new.bottom_right.y - 1
-                )
-                > 2
-            ):
-                implicit_rects.append(
-                    Rect(
-                        Point(left_bound + 1, new.bottom_right.y + 1),
-                        Point(right_bound - 1, lower_bound - 1),
-                    )
-                )
-        while right:
-            cell = right.pop()
-            upper_bound = lower_bound = cell[1]
-            while not is_covered(cell[0], upper_bound):
-                upper_bound -= 1
-            while not is_covered(cell[0], lower_bound):
-                lower_bound += 1
-            # Assert left bound consists of covered cells
-            if not all(
-                is_covered(new.bottom_right.x, y)
-                for y in range(upper_bound + 1, lower_bound)
-            ):
+        # directly adjacent to the side of the rectangle, so that cells is empty after the first iteration.
+        while cells:
+            start = end = cells.pop()
+            while not is_covered(start, near):
+                start -= 1
+            while not is_covered(end, near):
+                end += 1
+            inner = slice(start + 1, end)
+            # All cells of this block lead to the same result, so don't visit them again
+            cells.difference_update(range(start + 1, end))
+            # Assert that the block is bounded by the new rect
+            if not covered[edge, inner].all():
                 continue
-            right_bound = cell[0]
+            # Extend the block away from the new rect until it hits covered cells
+            v = near
             visited_numbers = 0
             failed = False
-            while not failed:
-                # Check for upper bound
-                if right_bound > cell[0] and any(
-                    is_covered(right_bound, y)
-                    for y in range(upper_bound + 1, lower_bound)
-                ):
-                    break
-                if not is_covered(right_bound, upper_bound) or not is_covered(
-                    right_bound, lower_bound
+            while 0 <= v < self.grid_size and not covered[v, inner].any():
+                visited_numbers += int(np.count_nonzero(numbers[v, inner]))
+                if visited_numbers > 1 or not (
+                    is_covered(start, v) and is_covered(end, v)
                 ):
                     failed = True
                     break
-                visited_numbers += sum(
-                    bool(self.numbers[y][right_bound])
-                    for y in range(upper_bound + 1, lower_bound)
-                )
-                if visited_numbers > 1:
-                    failed = True
-                    break
-                # Remove visited cells
-                right = [
-                    cell
-                    for cell in right
-                    if not (
-                        upper_bound < cell[1] < lower_bound and cell[0] == right_bound
-                    )
-                ]
-                right_bound += 1
+                v += step
 
             if failed or visited_numbers != 1:
                 continue
+            # Assert that the far bound consists of covered cells and that the block
+            # isn't a single cell
             if (
-                all(
-                    is_covered(right_bound, y)
-                    for y in range(upper_bound + 1, lower_bound)
-                )
-                and (
-                    lower_bound - upper_bound - 1 + right_bound - new.bottom_right.x - 1
-                )
-                > 2
-            ):
-                implicit_rects.append(
-                    Rect(
-                        Point(new.bottom_right.x + 1, upper_bound + 1),
-                        Point(right_bound - 1, lower_bound - 1),
-                    )
-                )
-        while left:
-            cell = left.pop()
-            upper_bound = lower_bound = cell[1]
-            while not is_covered(cell[0], upper_bound):
-                upper_bound -= 1
-            while not is_covered(cell[0], lower_bound):
-                lower_bound += 1
-            # Assert right bound consists of covered cells
-            if not all(
-                is_covered(new.top_left.x, y)
-                for y in range(upper_bound + 1, lower_bound)
-            ):
-                continue
-            left_bound = cell[0]
-            visited_numbers = 0
-            failed = False
-            while not failed:
-                # Check for upper bound
-                if left_bound < cell[0] and any(
-                    is_covered(left_bound, y)
-                    for y in range(upper_bound + 1, lower_bound)
-                ):
-                    break
-                if not is_covered(left_bound, upper_bound) or not is_covered(
-                    left_bound, lower_bound
-                ):
-                    failed = True
-                    break
-                visited_numbers += sum(
-                    bool(self.numbers[y][left_bound])
-                    for y in range(upper_bound + 1, lower_bound)
-                )
-                if visited_numbers > 1:
-                    failed = True
-                    break
-                # Remove visited cells
-                left = [
-                    cell
-                    for cell in left
-                    if not (
-                        upper_bound < cell[1] < lower_bound and cell[0] == left_bound
-                    )
-                ]
-                left_bound -= 1
-
-            if failed or visited_numbers != 1:
+                0 <= v < self.grid_size and not covered[v, inner].all()
+            ) or end - start - 1 + abs(v - edge) - 1 <= 2:
                 continue
-            if (
-                all(
-                    is_covered(left_bound, y)
-                    for y in range(upper_bound + 1, lower_bound)
-                )
-                and (lower_bound - upper_bound - 1 + new.top_left.x - left_bound - 1)
-                > 2
-            ):
-                implicit_rects.append(
-                    Rect(
-                        Point(left_bound + 1, upper_bound + 1),
-                        Point(new.top_left.x - 1, lower_bound - 1),
-                    )
-                )
-
-        for rect in implicit_rects:
-            self._append_rect(rect)
-
-        return self.verify()
+            if dir_x:
+                rect = Rect(Point(near, start + 1), Point(v - step, end - 1))
+            else:
+                rect = Rect(Point(start + 1, near), Point(end - 1, v - step))
+            implicit_rects.append(rect)
+        return implicit_rects
 
     def _append_rect(self, rect: Rect):
+        i = len(self.rects)
+        self.rect_at[rect.top : rect.bottom + 1, rect.left : rect.right + 1] = i
         self.rects.append(rect)
         self.rect_area += rect.area
-        # Set cells as covered
-        for y in range(rect.top_left.y, rect.bottom_right.y + 1):
-            for x in range(rect.top_left.x, rect.bottom_right.x + 1):
-                self.covered[y][x] = 1
+        self.board_surface = None
+        self.dirty = True
 
     def delete_intersecting_point(self, point: Point) -> None:
-        """Delete all existing rects that contain a given Point"""
-        self.delete_rects_by_indices(
-            [i for i, rect in enumerate(self.rects) if rect.contains_point(point)]
-        )
+        """Delete the rect that contains a given Point, if there is one"""
+        if not (0 <= point.x < self.grid_size and 0 <= point.y < self.grid_size):
+            return
+        i = int(self.rect_at[point.y, point.x])
+        if i >= 0:
+            self.delete_rects_by_indices([i])
 
     def delete_intersecting_rect(self, other: Rect) -> None:
         """Remove existing rects that intersect with a given rect"""
-        intersecting = [
-            i for i, rect in enumerate(self.rects) if rect.intersects(other)
-        ]
-        self.delete_rects_by_indices(intersecting)
+        indices = np.unique(
+            self.rect_at[
+                max(0, other.top) : other.bottom + 1,
+                max(0, other.left) : other.right + 1,
+            ]
+        )
+        self.delete_rects_by_indices(indices[indices >= 0].tolist())
 
     def delete_rects_by_indices(self, indices: list[int]) -> None:
+        if not indices:
+            return
         deleted = [self.rects[i] for i in indices]
-        self.rects = [rect for i, rect in enumerate(self.rects) if i not in indices]
+        index_set = set(indices)
+        self.rects = [rect for i, rect in enumerate(self.rects) if i not in index_set]
+        self.rect_area -= sum(rect.area for rect in deleted)
+        self.board_surface = None
+        self.dirty = True
         for rect in deleted:
-            self.rect_area -= rect.area
-            for y in range(rect.top_left.y, rect.bottom_right.y + 1):
-                for x in range(rect.top_left.x, rect.bottom_right.x + 1):
-                    self.covered[y][x] = 0
+            self.rect_at[rect.top : rect.bottom + 1, rect.left : rect.right + 1] = -1
+        # Rects after the first deleted one have moved to a lower index
+        for i in range(min(indices), len(self.rects)):
+            rect = self.rects[i]
+            self.rect_at[rect.top : rect.bottom + 1, rect.left : rect.right + 1] = i
 
     def verify(self) -> bool:
         return (
@@ -1030,18 +836,39 @@ class Game:
         )
 
 
-def empty_square_grid(size) -> list[list[int]]:
-    return [[0 for _ in range(size)] for _ in range(size)]
+def empty_square_grid(size, dtype=np.uint8) -> np.ndarray:
+    return np.zeros((size, size), dtype=dtype)
+
+
+def space_around(blocked: np.ndarray, i: int) -> tuple[int, int]:
+    """Return the number of consecutive unblocked cells before and after index i"""
+    indices = np.flatnonzero(blocked)
+    before = indices[indices < i]
+    after = indices[indices > i]
+    return (
+        i - (int(before[-1]) if before.size else -1) - 1,
+        (int(after[0]) if after.size else blocked.size) - i - 1,
+    )
+
+
+def random_other(i: int, before: int, after: int) -> int:
+    """Return a random index other than i, at most `before` below or `after` above it"""
+    offset = randrange(before + after)
+    return i - before + offset + (offset >= before)
 
 
 def pos_to_cell(pos, grid_pos) -> tuple[int, int]:
     return (
-        int((pos[0] - grid_pos[0]) / CELL_SIZE),
-        int((pos[1] - grid_pos[1]) / CELL_SIZE),
+        (pos[0] - grid_pos[0]) // CELL_SIZE,
+        (pos[1] - grid_pos[1]) // CELL_SIZE,
     )
 
 
 def main():
+    global CELL_SIZE, FONT_SIZE
+    CELL_SIZE = calc_cell_size(GRID_SIZE, CELL_BASE_SIZE, get_monitor())
+    FONT_SIZE = calc_font_size(CELL_SIZE)
+
     pygame.font.init()
 
     game = Game(GRID_SIZE)
@@ -1058,12 +885,19 @@ def main():
     reset = False
     while running:
         clock.tick(FRAMERATE)
-        running, reset = game.update(pygame.event.get())
+        events = pygame.event.get()
+        if not events and not game.dirty:
+            # Nothing changes without input, so sleep until the next event
+            events = [pygame.event.wait()]
+        running, reset = game.update(events)
         if reset:
             game = Game(GRID_SIZE)
+        if not game.dirty:
+            continue
         screen.fill(BACKGROUND_COLOR)
         game.draw(screen, GRID_DRAWING_POS)
         pygame.display.flip()
+        game.dirty = False
 
 
 if __name__ == "__main__":